@@ -19,3 +19,9 @@ class RandomAgent(interface.implements(sandbox_rl.core.interfaces.IGameAgent)):
 
     def train(self, batch: typing.Any) -> None:
         pass
+
+    def get_parameters(self) -> typing.Dict[str, typing.Any]:
+        return {"rng_state": self.rng.bit_generator.state}
+
+    def set_parameters(self, parameters: typing.Dict[str, typing.Any]) -> None:
+        self.rng.bit_generator.state = parameters["rng_state"]
@@ -18,6 +18,9 @@ class MCTS(interface.implements(sandbox_rl.core.interfaces.ILearningAgent)):
         train_every: int = 1,
         c_puct: float = 1.4,
         temperature: float = 1.0,
+        episode_callback: typing.Optional[typing.Callable[[int], None]] = None,
+        checkpointer: typing.Optional[sandbox_rl.core.interfaces.ICheckpointer] = None,
+        checkpoint_every: int = 0,
     ) -> None:
         self.initial_game_state = initial_game_state
         self.game_agent = game_agent
@@ -28,15 +31,59 @@ class MCTS(interface.implements(sandbox_rl.core.interfaces.ILearningAgent)):
         self.batch_size = batch_size
         self.c_puct = c_puct
         self.temperature = temperature
+        self.episode_callback = episode_callback
+        self.checkpointer = checkpointer
+        self.checkpoint_every = checkpoint_every
+        self.episode = 0
+        self.simulation_count = 0
+        self.game_count = 0
+        self.sample_count = 0
 
     def execute(self) -> None:
-        for episode in range(1, self.episodes + 1):
+        for episode in range(self.episode + 1, self.episodes + 1):
             self.self_play()
 
             if episode % self.train_every == 0:
                 batch = self.replay_buffer.sample(self.batch_size)
                 self.game_agent.train(batch)
 
+            self.episode = episode
+
+            if self.checkpointer is not None and self.is_checkpoint_episode(episode):
+                self.checkpointer.save(self)
+
+            if self.episode_callback is not None:
+                self.episode_callback(episode)
+
+        if self.checkpointer is not None:
+            self.checkpointer.wait()
+
+    def get_game_agent(self) -> sandbox_rl.core.interfaces.IGameAgent:
+        return self.game_agent
+
+    def get_replay_buffer(self) -> sandbox_rl.core.interfaces.IReplayBuffer:
+        return self.replay_buffer
+
+    def get_progress(self) -> typing.Dict[str, int]:
+        return {
+            "episode": self.episode,
+            "simulation_count": self.simulation_count,
+            "game_count": self.game_count,
+            "sample_count": self.sample_count,
+        }
+
+    def set_progress(self, progress: typing.Dict[str, int]) -> None:
+        self.episode = progress["episode"]
+        self.simulation_count = progress["simulation_count"]
+        self.game_count = progress["game_count"]
+        self.sample_count = progress["sample_count"]
+
+    def is_checkpoint_episode(self, episode: int) -> bool:
+        if episode == self.episodes:
+            return True
+
+        return self.checkpoint_every > 0 and episode % self.checkpoint_every == 0
+
     def self_play(self) -> None:
         state = copy.deepcopy(self.initial_game_state)
         episode_data = []
@@ -57,6 +104,9 @@ class MCTS(interface.implements(sandbox_rl.core.interfaces.ILearningAgent)):
             self.replay_buffer.store((state.encode_state(), np.array(list(policy.values())), final_value))
             final_value = -final_value
 
+        self.game_count += 1
+        self.sample_count += len(episode_data)
+
     def search(self, initial_state: sandbox_rl.core.interfaces.IGameState) -> "MCTS.Node":
         root = MCTS.Node(state=initial_state)
 
@@ -77,6 +127,8 @@ class MCTS(interface.implements(sandbox_rl.core.interfaces.ILearningAgent)):
 
             node.backpropagate(value)
 
+        self.simulation_count += self.simulations
+
         return root
 
     def get_action_probabilities(self, root: "MCTS.Node") -> typing.Dict[typing.Tuple[int, int], float]:
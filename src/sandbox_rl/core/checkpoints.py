@@ -0,0 +1,291 @@
+import sandbox_rl.core.interfaces
+import interface
+import typing
+import json
+import os
+import queue
+import re
+import threading
+import uuid
+import numpy as np
+
+
+class Checkpointer(interface.implements(sandbox_rl.core.interfaces.ICheckpointer)):
+    MANIFEST_FILE = "checkpoint.json"
+    VERSION = 1
+    MAX_CHUNKS = 16
+    MAX_PENDING_WRITES = 4
+    DATA_FILE_PATTERN = re.compile(r"(?:replay|agent)-\d{8}-(?P<run_id>[0-9a-f]{8})\.npz(?:\.tmp)?")
+
+    def __init__(
+        self,
+        directory: str,
+        overwrite: bool = False,
+        run_config: typing.Optional[typing.Dict[str, typing.Any]] = None,
+    ) -> None:
+        self.directory = directory
+        self.overwrite = overwrite
+        self.run_config = {} if run_config is None else run_config
+        self.manifest: typing.Optional[typing.Dict[str, typing.Any]] = None
+        # file names carry a per-run id so a new run never replaces files an existing manifest references
+        self.run_id = uuid.uuid4().hex[:8]
+        # files of these runs may be removed once unreferenced, other runs are only touched when overwriting
+        self.owned_run_ids = {self.run_id}
+        self.writes: queue.Queue = queue.Queue(maxsize=self.MAX_PENDING_WRITES)
+        self.writer: typing.Optional[threading.Thread] = None
+        self.writer_error: typing.Optional[BaseException] = None
+        self.writer_error_raised = False
+
+    def exists(self) -> bool:
+        return os.path.exists(os.path.join(self.directory, self.MANIFEST_FILE))
+
+    def read_run_config(self) -> typing.Optional[typing.Dict[str, typing.Any]]:
+        if not self.exists():
+            return None
+
+        return self._read_manifest()["run_config"]
+
+    def save(self, learning_agent: sandbox_rl.core.interfaces.ILearningAgent) -> None:
+        # state is snapshotted here and written in order by a single background thread, only samples stored
+        # since the previous save are written and the manifest is replaced last so that a killed run keeps the
+        # previous checkpoint, saves only block once MAX_PENDING_WRITES snapshots are queued
+        if self.writer_error is not None and self.writer_error_raised and self.overwrite:
+            # the manifest in memory may reference files that were never written, so start a full checkpoint
+            self._reset_writer()
+            self.manifest = None
+
+        self._raise_writer_error()
+
+        if self.manifest is None and not self.overwrite and self.exists():
+            raise FileExistsError(f"{self.directory} already holds a checkpoint, load it or enable overwrite")
+
+        chunks: typing.List[typing.Dict[str, typing.Any]] = [] if self.manifest is None else self.manifest["chunks"]
+        replay_buffer = learning_agent.get_replay_buffer()
+        progress = learning_agent.get_progress()
+        saved_sample_count = 0 if self.manifest is None else self.manifest["progress"]["sample_count"]
+        new_samples = replay_buffer.latest(progress["sample_count"] - saved_sample_count)
+
+        chunk_file = None
+        if new_samples:
+            chunk_file = f"replay-{progress['episode']:08d}-{self.run_id}.npz"
+            chunks = self._live_chunks(
+                chunks + [{"file": chunk_file, "samples": len(new_samples)}],
+                replay_buffer.max_size,
+            )
+
+            # merge the newest chunks so the file count and load time stay bounded
+            if len(chunks) > self.MAX_CHUNKS:
+                merge_start = self._merge_start(chunks)
+                merge_count = sum(chunk["samples"] for chunk in chunks[merge_start:])
+                new_samples = replay_buffer.latest(merge_count)
+                chunks = chunks[:merge_start] + [{"file": chunk_file, "samples": len(new_samples)}]
+
+        agent_parameters = learning_agent.get_game_agent().get_parameters()
+        agent_arrays = {
+            key: value.copy() for key, value in agent_parameters.items() if isinstance(value, np.ndarray)
+        }
+        agent_file = f"agent-{progress['episode']:08d}-{self.run_id}.npz"
+
+        bit_generator, keys, position, has_gauss, cached_gaussian = np.random.get_state(legacy=True)
+        manifest = {
+            "version": self.VERSION,
+            "run_config": self.run_config,
+            "progress": progress,
+            "chunks": chunks,
+            "agent_file": agent_file,
+            "agent_parameters": {
+                key: value for key, value in agent_parameters.items() if not isinstance(value, np.ndarray)
+            },
+            "numpy_random_state": {
+                "bit_generator": bit_generator,
+                "keys": keys.tolist(),
+                "position": position,
+                "has_gauss": has_gauss,
+                "cached_gaussian": cached_gaussian,
+            },
+        }
+        self.manifest = manifest
+
+        if self.writer is None:
+            self.writer = threading.Thread(target=self._write_loop, name="checkpoint-writer", daemon=True)
+            self.writer.start()
+
+        self.writes.put((manifest, chunk_file, new_samples, agent_arrays))
+
+    def wait(self) -> None:
+        self.writes.join()
+        self._raise_writer_error()
+
+    def load(self, learning_agent: sandbox_rl.core.interfaces.ILearningAgent) -> bool:
+        # loading replaces the in-memory manifest with the one on disk, which is also how a failed write is
+        # recovered from
+        self._reset_writer()
+        self.manifest = None
+
+        if not self.exists():
+            return False
+
+        manifest = self._read_manifest()
+
+        mismatched_keys = sorted(
+            key for key, value in self.run_config.items() if manifest["run_config"].get(key) != value
+        )
+        if mismatched_keys:
+            raise ValueError(f"checkpoint was saved with different settings for {', '.join(mismatched_keys)}")
+
+        replay_buffer = learning_agent.get_replay_buffer()
+        for chunk in manifest["chunks"]:
+            with np.load(os.path.join(self.directory, chunk["file"])) as arrays:
+                samples = self._decode_samples(arrays)
+
+            if len(samples) != chunk["samples"]:
+                raise ValueError(f"{chunk['file']} holds {len(samples)} samples, expected {chunk['samples']}")
+
+            for sample in samples:
+                replay_buffer.store(sample)
+
+        with np.load(os.path.join(self.directory, manifest["agent_file"])) as arrays:
+            agent_arrays = {key: arrays[key] for key in arrays.files}
+        learning_agent.get_game_agent().set_parameters({**manifest["agent_parameters"], **agent_arrays})
+
+        random_state = manifest["numpy_random_state"]
+        np.random.set_state((
+            random_state["bit_generator"],
+            np.array(random_state["keys"], dtype=np.uint32),
+            random_state["position"],
+            random_state["has_gauss"],
+            random_state["cached_gaussian"],
+        ))
+
+        learning_agent.set_progress(manifest["progress"])
+        self.manifest = manifest
+        for file_name in [manifest["agent_file"]] + [chunk["file"] for chunk in manifest["chunks"]]:
+            self.owned_run_ids.add(self.DATA_FILE_PATTERN.fullmatch(file_name).group("run_id"))
+
+        return True
+
+    def _read_manifest(self) -> typing.Dict[str, typing.Any]:
+        with open(os.path.join(self.directory, self.MANIFEST_FILE), "r") as file:
+            manifest = json.load(file)
+
+        if manifest["version"] != self.VERSION:
+            raise ValueError(f"unsupported checkpoint version {manifest['version']}")
+
+        return manifest
+
+    def _raise_writer_error(self) -> None:
+        # the error stays in place so that no later snapshot is written on top of a failed one
+        if self.writer_error is not None:
+            self.writer_error_raised = True
+            raise self.writer_error
+
+    def _reset_writer(self) -> None:
+        self.writes.join()
+        self.writer_error = None
+        self.writer_error_raised = False
+
+    def _write_loop(self) -> None:
+        while True:
+            writes = [self.writes.get()]
+            while not self.writes.empty():
+                writes.append(self.writes.get_nowait())
+
+            try:
+                # later snapshots may reference files of a failed write, so nothing more is written after an error
+                if self.writer_error is None:
+                    self._write(writes)
+            except BaseException as error:
+                self.writer_error = error
+            finally:
+                for _ in writes:
+                    self.writes.task_done()
+
+    def _write(self, writes: typing.List[typing.Tuple]) -> None:
+        # snapshots that queued up while the writer was busy are coalesced, only the chunks referenced by the
+        # newest manifest are written followed by its agent file and the manifest itself
+        manifest, _, _, agent_arrays = writes[-1]
+        referenced_files = {chunk["file"] for chunk in manifest["chunks"]}
+
+        os.makedirs(self.directory, exist_ok=True)
+
+        for _, chunk_file, samples, _ in writes:
+            if chunk_file in referenced_files:
+                self._atomic_write(chunk_file, lambda file: np.savez(file, **self._encode_samples(samples)))
+
+        self._atomic_write(manifest["agent_file"], lambda file: np.savez(file, **agent_arrays))
+        self._atomic_write(self.MANIFEST_FILE, lambda file: file.write(json.dumps(manifest).encode()))
+        self._remove_unreferenced_files(manifest)
+
+    def _atomic_write(self, file_name: str, write: typing.Callable[[typing.BinaryIO], typing.Any]) -> None:
+        path = os.path.join(self.directory, file_name)
+        temporary_path = f"{path}.tmp"
+
+        with open(temporary_path, "wb") as file:
+            write(file)
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(temporary_path, path)
+
+    def _remove_unreferenced_files(self, manifest: typing.Dict[str, typing.Any]) -> None:
+        referenced_files = {self.MANIFEST_FILE, manifest["agent_file"]}
+        referenced_files.update(chunk["file"] for chunk in manifest["chunks"])
+
+        for file_name in os.listdir(self.directory):
+            match = self.DATA_FILE_PATTERN.fullmatch(file_name)
+            if match is None or file_name in referenced_files:
+                continue
+
+            if self.overwrite or match.group("run_id") in self.owned_run_ids:
+                os.remove(os.path.join(self.directory, file_name))
+
+    @staticmethod
+    def _live_chunks(
+        chunks: typing.List[typing.Dict[str, typing.Any]],
+        max_size: int,
+    ) -> typing.List[typing.Dict[str, typing.Any]]:
+        # keep the newest chunks that still hold samples the replay buffer has not evicted
+        live_chunks: typing.List[typing.Dict[str, typing.Any]] = []
+        live_samples = 0
+
+        for chunk in reversed(chunks):
+            if live_samples >= max_size:
+                break
+            live_chunks.append(chunk)
+            live_samples += chunk["samples"]
+
+        return live_chunks[::-1]
+
+    @staticmethod
+    def _merge_start(chunks: typing.List[typing.Dict[str, typing.Any]]) -> int:
+        # merge at least the two newest chunks and keep absorbing older chunks no larger than the merged total,
+        # so chunk sizes grow geometrically and every sample is rewritten a logarithmic number of times
+        merge_start = len(chunks) - 2
+        merged_samples = chunks[-1]["samples"] + chunks[-2]["samples"]
+
+        while merge_start > 0 and chunks[merge_start - 1]["samples"] <= merged_samples:
+            merge_start -= 1
+            merged_samples += chunks[merge_start]["samples"]
+
+        return merge_start
+
+    @staticmethod
+    def _encode_samples(samples: typing.List[typing.Tuple]) -> typing.Dict[str, np.ndarray]:
+        states, policies, values = zip(*samples)
+
+        return {
+            "states": np.stack(states),
+            "policies": np.concatenate(policies),
+            "policy_lengths": np.array([len(policy) for policy in policies], dtype=np.int64),
+            "values": np.array(values, dtype=np.float64),
+        }
+
+    @staticmethod
+    def _decode_samples(arrays: typing.Mapping[str, np.ndarray]) -> typing.List[typing.Tuple]:
+        states, policy_lengths, values = arrays["states"], arrays["policy_lengths"], arrays["values"]
+        policies = np.split(arrays["policies"], np.cumsum(policy_lengths)[:-1])
+
+        if not len(states) == len(policy_lengths) == len(values):
+            raise ValueError("replay chunk arrays have mismatched lengths")
+
+        return [(state, policy, value) for state, policy, value in zip(states, policies, values.tolist())]
@@ -36,11 +36,29 @@ class IGameAgent(interface.Interface):
     def train(self, batch: typing.Any) -> None:
         raise NotImplementedError()
 
+    def get_parameters(self) -> typing.Dict[str, typing.Any]:
+        raise NotImplementedError()
+
+    def set_parameters(self, parameters: typing.Dict[str, typing.Any]) -> None:
+        raise NotImplementedError()
+
 
 class ILearningAgent(interface.Interface):
     def execute(self) -> None:
         raise NotImplementedError()
 
+    def get_game_agent(self) -> IGameAgent:
+        raise NotImplementedError()
+
+    def get_replay_buffer(self) -> "IReplayBuffer":
+        raise NotImplementedError()
+
+    def get_progress(self) -> typing.Dict[str, int]:
+        raise NotImplementedError()
+
+    def set_progress(self, progress: typing.Dict[str, int]) -> None:
+        raise NotImplementedError()
+
 
 class IReplayBuffer(interface.Interface):
     def __init__(self, max_size: int = 10000) -> None:
@@ -52,5 +70,23 @@ class IReplayBuffer(interface.Interface):
     def sample(self, batch_size: int) -> typing.List[typing.Tuple]:
         raise NotImplementedError()
 
+    def latest(self, count: int) -> typing.List[typing.Tuple]:
+        raise NotImplementedError()
+
+    @property
+    def max_size(self) -> int:
+        raise NotImplementedError()
+
     def __len__(self) -> int:
         raise NotImplementedError()
+
+
+class ICheckpointer(interface.Interface):
+    def save(self, learning_agent: ILearningAgent) -> None:
+        raise NotImplementedError()
+
+    def load(self, learning_agent: ILearningAgent) -> bool:
+        raise NotImplementedError()
+
+    def wait(self) -> None:
+        raise NotImplementedError()
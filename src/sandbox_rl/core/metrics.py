@@ -0,0 +1,51 @@
+import sys
+import time
+import typing
+
+
+def peak_rss_bytes() -> typing.Optional[int]:
+    try:
+        import resource
+    except ImportError:
+        # resource is unix only, windows has no peak rss without extra dependencies
+        return None
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    # linux reports kibibytes while macos reports bytes
+    if sys.platform == "darwin":
+        return peak_rss
+
+    return peak_rss * 1024
+
+
+class ThroughputMeter():
+    def __init__(self, clock: typing.Callable[[], float] = time.perf_counter) -> None:
+        self.clock = clock
+        self.start_time = self.clock()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.start_time
+
+    def rates(self, simulations: int, games: int, samples: int) -> typing.Dict[str, float]:
+        elapsed = max(self.elapsed(), sys.float_info.epsilon)
+
+        return {
+            "simulations_per_second": simulations / elapsed,
+            "games_per_second": games / elapsed,
+            "samples_per_second": samples / elapsed,
+        }
+
+    def report(self, simulations: int, games: int, samples: int) -> str:
+        rates = self.rates(simulations, games, samples)
+        report = (
+            f"sims/s {rates['simulations_per_second']:.1f}"
+            f" | games/s {rates['games_per_second']:.2f}"
+            f" | samples/s {rates['samples_per_second']:.1f}"
+        )
+
+        peak_rss = peak_rss_bytes()
+        if peak_rss is not None:
+            report += f" | peak rss {peak_rss / 2**20:.1f} MiB"
+
+        return report
@@ -1,4 +1,5 @@
 import collections
+import itertools
 import typing
 import interface
 import numpy as np
@@ -17,5 +18,12 @@ class ReplayBuffer(interface.implements(sandbox_rl.core.interfaces.IReplayBuffer
         indices = np.random.choice(len(self), size=batch_size, replace=False)
         return [self.buffer[idx] for idx in indices]
 
+    def latest(self, count: int) -> typing.List[typing.Tuple]:
+        return list(itertools.islice(reversed(self.buffer), count))[::-1]
+
+    @property
+    def max_size(self) -> int:
+        return self.buffer.maxlen
+
     def __len__(self) -> int:
         return len(self.buffer)
@@ -1,8 +1,321 @@
+import sandbox_rl.application.game_agents
+import sandbox_rl.application.game_states
+import sandbox_rl.application.learning_agents
+import sandbox_rl.core.checkpoints
+import sandbox_rl.core.metrics
+import sandbox_rl.core.models
+import argparse
+import cProfile
+import json
+import math
+import statistics
 import sys
+import typing
+import numpy as np
 
 
-def main() -> int:
-    print('Hello, World!')
+GAME_STATES: typing.Dict[str, typing.Callable[[], typing.Any]] = {
+    "tictactoe": sandbox_rl.application.game_states.TicTacToe,
+}
+
+GAME_AGENTS: typing.Dict[str, typing.Callable[..., typing.Any]] = {
+    "random": sandbox_rl.application.game_agents.RandomAgent,
+}
+
+DEFAULT_CONFIG: typing.Dict[str, typing.Any] = {
+    "game": "tictactoe",
+    "agent": "random",
+    "episodes": 100,
+    "simulations": 50,
+    "batch_size": 32,
+    "train_every": 1,
+    "c_puct": 1.4,
+    "temperature": 1.0,
+    "buffer_size": 10000,
+    "seed": None,
+    "log_every": 10,
+    "profile": None,
+    "repeats": 3,
+    "checkpoint_dir": None,
+    "checkpoint_every": 10,
+    "resume": False,
+    "overwrite": False,
+}
+
+BENCH_SEED = 0
+
+POSITIVE_KEYS = ("episodes", "simulations", "batch_size", "train_every", "buffer_size", "repeats", "checkpoint_every")
+NON_NEGATIVE_KEYS = ("log_every",)
+REAL_KEYS = ("c_puct", "temperature")
+# settings that change how a run continues, stored with its checkpoints so a resume cannot diverge
+RUN_CONFIG_KEYS = (
+    "game", "agent", "simulations", "batch_size", "train_every", "c_puct", "temperature", "buffer_size", "seed",
+)
+
+
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a positive integer")
+
+    return number
+
+
+def non_negative_int(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative integer")
+
+    return number
+
+
+def non_negative_float(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError(f"{value} is not a non-negative number")
+
+    return number
+
+
+def is_integer(value: typing.Any) -> bool:
+    # json booleans load as bool, which is a subclass of int
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def is_real(value: typing.Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--config", help="path to a json file with run settings, overridden by arguments")
+    common.add_argument("--game", choices=sorted(GAME_STATES))
+    common.add_argument("--agent", choices=sorted(GAME_AGENTS))
+    common.add_argument("--episodes", type=positive_int)
+    common.add_argument("--simulations", type=positive_int)
+    common.add_argument("--batch-size", type=positive_int)
+    common.add_argument("--train-every", type=positive_int)
+    common.add_argument("--c-puct", type=float)
+    common.add_argument("--temperature", type=non_negative_float)
+    common.add_argument("--buffer-size", type=positive_int)
+    common.add_argument(
+        "--log-every", type=non_negative_int, help="episodes between throughput reports, 0 disables them"
+    )
+    common.add_argument("--profile", metavar="PATH", help="write a cProfile dump of the run to PATH")
+
+    parser = argparse.ArgumentParser(prog="main", description="Self-play training for the sandbox RL agents.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    train = subparsers.add_parser("train", parents=[common], help="run self-play and training")
+    train.add_argument("--seed", type=int)
+    train.add_argument("--checkpoint-dir", metavar="PATH", help="directory to write checkpoints to")
+    train.add_argument("--checkpoint-every", type=positive_int, help="episodes between checkpoints")
+    train.add_argument("--resume", action="store_true", default=None, help="continue from the checkpoint directory")
+    train.add_argument(
+        "--overwrite", action="store_true", default=None, help="replace a checkpoint from an earlier run"
+    )
+
+    bench = subparsers.add_parser("bench", parents=[common], help="time fixed-seed runs for reproducible comparisons")
+    bench.add_argument("--repeats", type=positive_int)
+
+    return parser
+
+
+def load_config(args: argparse.Namespace) -> typing.Dict[str, typing.Any]:
+    config = dict(DEFAULT_CONFIG)
+    explicit_keys: typing.Set[str] = set()
+
+    if args.config is not None:
+        with open(args.config, "r") as file:
+            file_config = json.load(file)
+
+        if not isinstance(file_config, dict):
+            raise ValueError(f"{args.config} must hold a json object")
+
+        unknown_keys = set(file_config) - set(DEFAULT_CONFIG)
+        if unknown_keys:
+            raise ValueError(f"unknown config keys: {', '.join(sorted(unknown_keys))}")
+
+        config.update(file_config)
+        explicit_keys.update(file_config)
+
+    for key, value in vars(args).items():
+        if key in DEFAULT_CONFIG and value is not None:
+            config[key] = value
+            explicit_keys.add(key)
+
+    if args.command == "bench":
+        config["seed"] = BENCH_SEED
+        config["checkpoint_dir"] = None
+        config["resume"] = False
+        config["overwrite"] = False
+
+    validate_config(config)
+
+    if config["resume"]:
+        restore_run_config(config, explicit_keys)
+
+    return config
+
+
+def restore_run_config(config: typing.Dict[str, typing.Any], explicit_keys: typing.Set[str]) -> None:
+    saved_run_config = sandbox_rl.core.checkpoints.Checkpointer(config["checkpoint_dir"]).read_run_config()
+    if saved_run_config is None:
+        return
+
+    for key in RUN_CONFIG_KEYS:
+        if key in explicit_keys and config[key] != saved_run_config[key]:
+            raise ValueError(
+                f"{key} is {config[key]!r} but the checkpoint was saved with {saved_run_config[key]!r}"
+            )
+
+        config[key] = saved_run_config[key]
+
+
+def validate_config(config: typing.Dict[str, typing.Any]) -> None:
+    # values from a config file bypass the argument types, so every setting is checked here
+    for key in POSITIVE_KEYS:
+        if not is_integer(config[key]) or config[key] <= 0:
+            raise ValueError(f"{key} must be a positive integer, got {config[key]!r}")
+
+    for key in NON_NEGATIVE_KEYS:
+        if not is_integer(config[key]) or config[key] < 0:
+            raise ValueError(f"{key} must be a non-negative integer, got {config[key]!r}")
+
+    for key in REAL_KEYS:
+        if not is_real(config[key]):
+            raise ValueError(f"{key} must be a number, got {config[key]!r}")
+
+    if config["temperature"] < 0:
+        raise ValueError(f"temperature must be non-negative, got {config['temperature']!r}")
+
+    if config["seed"] is not None and not is_integer(config["seed"]):
+        raise ValueError(f"seed must be an integer, got {config['seed']!r}")
+
+    if config["profile"] is not None and not isinstance(config["profile"], str):
+        raise ValueError(f"profile must be a path, got {config['profile']!r}")
+
+    if not isinstance(config["game"], str) or config["game"] not in GAME_STATES:
+        raise ValueError(f"unknown game {config['game']!r}")
+
+    if not isinstance(config["agent"], str) or config["agent"] not in GAME_AGENTS:
+        raise ValueError(f"unknown agent {config['agent']!r}")
+
+    if config["resume"] and config["checkpoint_dir"] is None:
+        raise ValueError("resume requires a checkpoint directory")
+
+    if config["resume"] and config["overwrite"]:
+        raise ValueError("resume and overwrite cannot be combined")
+
+    checkpoint_dir = config["checkpoint_dir"]
+    if (
+        checkpoint_dir is not None
+        and not config["resume"]
+        and not config["overwrite"]
+        and sandbox_rl.core.checkpoints.Checkpointer(checkpoint_dir).exists()
+    ):
+        raise ValueError(f"{checkpoint_dir} already holds a checkpoint, pass --resume or --overwrite")
+
+
+def build_learning_agent(
+    config: typing.Dict[str, typing.Any],
+    episode_callback: typing.Optional[typing.Callable[[int], None]] = None,
+) -> sandbox_rl.application.learning_agents.MCTS:
+    if config["seed"] is not None:
+        np.random.seed(config["seed"])
+
+    checkpointer = None
+    if config["checkpoint_dir"] is not None:
+        checkpointer = sandbox_rl.core.checkpoints.Checkpointer(
+            config["checkpoint_dir"],
+            overwrite=config["overwrite"],
+            run_config={key: config[key] for key in RUN_CONFIG_KEYS},
+        )
+
+    mcts = sandbox_rl.application.learning_agents.MCTS(
+        initial_game_state=GAME_STATES[config["game"]](),
+        game_agent=GAME_AGENTS[config["agent"]](seed=config["seed"]),
+        replay_buffer=sandbox_rl.core.models.ReplayBuffer(max_size=config["buffer_size"]),
+        episodes=config["episodes"],
+        simulations=config["simulations"],
+        batch_size=config["batch_size"],
+        train_every=config["train_every"],
+        c_puct=config["c_puct"],
+        temperature=config["temperature"],
+        episode_callback=episode_callback,
+        checkpointer=checkpointer,
+        checkpoint_every=config["checkpoint_every"],
+    )
+
+    if config["resume"] and checkpointer is not None:
+        if checkpointer.load(mcts):
+            print(f"resumed from episode {mcts.episode}", flush=True)
+
+    return mcts
+
+
+def run_training(config: typing.Dict[str, typing.Any]) -> sandbox_rl.application.learning_agents.MCTS:
+    def log_progress(episode: int) -> None:
+        if config["log_every"] > 0 and (episode % config["log_every"] == 0 or episode == config["episodes"]):
+            report = meter.report(
+                mcts.simulation_count - resumed_counts[0],
+                mcts.game_count - resumed_counts[1],
+                mcts.sample_count - resumed_counts[2],
+            )
+            print(f"episode {episode}/{config['episodes']} | {report}", flush=True)
+
+    mcts = build_learning_agent(config, episode_callback=log_progress)
+    # throughput only covers work done by this process, not the resumed counters
+    resumed_counts = (mcts.simulation_count, mcts.game_count, mcts.sample_count)
+    meter = sandbox_rl.core.metrics.ThroughputMeter()
+    mcts.execute()
+
+    return mcts
+
+
+def run_benchmark(config: typing.Dict[str, typing.Any]) -> typing.List[float]:
+    timings: typing.List[float] = []
+
+    for repeat in range(1, config["repeats"] + 1):
+        mcts = build_learning_agent(config)
+        meter = sandbox_rl.core.metrics.ThroughputMeter()
+        mcts.execute()
+        timings.append(meter.elapsed())
+
+        report = meter.report(mcts.simulation_count, mcts.game_count, mcts.sample_count)
+        print(f"repeat {repeat}/{config['repeats']} | {timings[-1]:.3f} s | {report}", flush=True)
+
+    print(
+        f"seed {config['seed']} | min {min(timings):.3f} s"
+        f" | median {statistics.median(timings):.3f} s"
+        f" | mean {statistics.mean(timings):.3f} s",
+        flush=True,
+    )
+
+    return timings
+
+
+def main(argv: typing.Optional[typing.List[str]] = None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        config = load_config(args)
+    except (OSError, ValueError) as error:
+        parser.error(str(error))
+
+    run = run_benchmark if args.command == "bench" else run_training
+
+    if config["profile"] is None:
+        run(config)
+        return 0
+
+    profiler = cProfile.Profile()
+    try:
+        profiler.runcall(run, config)
+    finally:
+        profiler.dump_stats(config["profile"])
+    print(f"profile written to {config['profile']}", flush=True)
 
     return 0
 
@@ -1,4 +1,7 @@
 import math
+import sandbox_rl.application.game_agents
+import sandbox_rl.application.game_states
+import sandbox_rl.core.models
 import sandbox_rl.application.learning_agents
 
 
@@ -78,3 +81,23 @@ def test_get_action_probabilities_nonzero_temperature():
     expected_probs = {(0, 0): 4 / 5, (0, 1): 1 / 5}
     for action, prob in action_probs.items():
         assert abs(prob - expected_probs[action]) < 1e-5
+
+
+def test_execute_counts_throughput_and_calls_episode_callback():
+    # assign
+    episodes_seen = []
+    mcts = sandbox_rl.application.learning_agents.MCTS(
+        initial_game_state=sandbox_rl.application.game_states.TicTacToe(),
+        game_agent=sandbox_rl.application.game_agents.RandomAgent(seed=0),
+        replay_buffer=sandbox_rl.core.models.ReplayBuffer(),
+        episodes=2,
+        simulations=3,
+        episode_callback=episodes_seen.append,
+    )
+    # act
+    mcts.execute()
+    # assert
+    assert episodes_seen == [1, 2]
+    assert mcts.game_count == 2
+    assert mcts.sample_count == len(mcts.replay_buffer)
+    assert mcts.simulation_count == 3 * mcts.sample_count
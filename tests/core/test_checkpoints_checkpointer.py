@@ -0,0 +1,272 @@
+import json
+import os
+import pytest
+import numpy as np
+import sandbox_rl.application.game_agents
+import sandbox_rl.application.game_states
+import sandbox_rl.application.learning_agents
+import sandbox_rl.core.checkpoints
+import sandbox_rl.core.models
+
+
+def build_mcts(episodes, checkpoint_dir, checkpoint_every=2, buffer_size=10000):
+    np.random.seed(0)
+    return sandbox_rl.application.learning_agents.MCTS(
+        initial_game_state=sandbox_rl.application.game_states.TicTacToe(),
+        game_agent=sandbox_rl.application.game_agents.RandomAgent(seed=0),
+        replay_buffer=sandbox_rl.core.models.ReplayBuffer(max_size=buffer_size),
+        episodes=episodes,
+        simulations=4,
+        checkpointer=sandbox_rl.core.checkpoints.Checkpointer(str(checkpoint_dir)),
+        checkpoint_every=checkpoint_every,
+    )
+
+
+def assert_same_run(first, second):
+    assert first.episode == second.episode
+    assert first.sample_count == second.sample_count
+    assert len(first.replay_buffer) == len(second.replay_buffer)
+    for first_sample, second_sample in zip(first.replay_buffer.buffer, second.replay_buffer.buffer):
+        assert first_sample[0].tobytes() == second_sample[0].tobytes()
+        assert first_sample[1].tobytes() == second_sample[1].tobytes()
+        assert first_sample[2] == second_sample[2]
+
+
+def test_load_without_checkpoint_returns_false(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=1, checkpoint_dir=tmp_path)
+    checkpointer = sandbox_rl.core.checkpoints.Checkpointer(str(tmp_path))
+
+    # act
+    loaded = checkpointer.load(mcts)
+
+    # assert
+    assert loaded is False
+    assert mcts.episode == 0
+
+
+def test_resume_continues_bit_for_bit(tmp_path):
+    # arrange
+    uninterrupted = build_mcts(episodes=6, checkpoint_dir=tmp_path / "uninterrupted")
+    uninterrupted.execute()
+    uninterrupted_random_state = np.random.get_state()[1].tobytes()
+    interrupted = build_mcts(episodes=4, checkpoint_dir=tmp_path / "interrupted")
+    interrupted.execute()
+
+    # act
+    resumed = build_mcts(episodes=6, checkpoint_dir=tmp_path / "interrupted")
+    resumed.checkpointer.load(resumed)
+    resumed.execute()
+
+    # assert
+    assert_same_run(uninterrupted, resumed)
+    assert np.random.get_state()[1].tobytes() == uninterrupted_random_state
+    assert uninterrupted.game_agent.get_parameters() == resumed.game_agent.get_parameters()
+
+
+def test_save_writes_only_new_samples_and_drops_evicted_chunks(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=6, checkpoint_dir=tmp_path, checkpoint_every=1, buffer_size=10)
+
+    # act
+    mcts.execute()
+
+    # assert
+    manifest = mcts.checkpointer.manifest
+    assert sum(chunk["samples"] for chunk in manifest["chunks"]) - manifest["chunks"][0]["samples"] < 10
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["checkpoint.json", manifest["agent_file"]] + [chunk["file"] for chunk in manifest["chunks"]]
+    )
+    restored = build_mcts(episodes=6, checkpoint_dir=tmp_path, buffer_size=10)
+    restored.checkpointer.load(restored)
+    assert_same_run(mcts, restored)
+
+
+def test_execute_saves_final_episode_off_interval(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=5, checkpoint_dir=tmp_path, checkpoint_every=3)
+
+    # act
+    mcts.execute()
+
+    # assert
+    assert mcts.checkpointer.manifest["progress"]["episode"] == 5
+
+
+def test_save_refuses_to_replace_checkpoint_of_another_run(tmp_path):
+    # arrange
+    build_mcts(episodes=2, checkpoint_dir=tmp_path).execute()
+    files_before = sorted(os.listdir(tmp_path))
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path)
+
+    # act & assert
+    with pytest.raises(FileExistsError):
+        mcts.execute()
+
+    assert sorted(os.listdir(tmp_path)) == files_before
+
+
+def test_save_with_overwrite_replaces_checkpoint_of_another_run(tmp_path):
+    # arrange
+    build_mcts(episodes=4, checkpoint_dir=tmp_path).execute()
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path)
+    mcts.checkpointer.overwrite = True
+
+    # act
+    mcts.execute()
+
+    # assert
+    manifest = mcts.checkpointer.manifest
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["checkpoint.json", manifest["agent_file"]] + [chunk["file"] for chunk in manifest["chunks"]]
+    )
+    restored = build_mcts(episodes=2, checkpoint_dir=tmp_path)
+    restored.checkpointer.load(restored)
+    assert_same_run(mcts, restored)
+
+
+def test_load_rejects_chunk_with_wrong_sample_count(tmp_path):
+    # arrange
+    build_mcts(episodes=2, checkpoint_dir=tmp_path).execute()
+    manifest_path = tmp_path / sandbox_rl.core.checkpoints.Checkpointer.MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text())
+    manifest["chunks"][0]["samples"] += 1
+    manifest_path.write_text(json.dumps(manifest))
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path)
+
+    # act & assert
+    with pytest.raises(ValueError):
+        mcts.checkpointer.load(mcts)
+
+
+def test_wait_raises_error_from_background_writer(tmp_path):
+    # arrange
+    blocking_file = tmp_path / "not-a-directory"
+    blocking_file.write_text("")
+    mcts = build_mcts(episodes=1, checkpoint_dir=blocking_file)
+
+    # act & assert
+    with pytest.raises(OSError):
+        mcts.execute()
+
+
+def test_save_merges_chunks_past_max_chunks(tmp_path):
+    # arrange
+    episodes = sandbox_rl.core.checkpoints.Checkpointer.MAX_CHUNKS + 3
+    mcts = build_mcts(episodes=episodes, checkpoint_dir=tmp_path, checkpoint_every=1)
+
+    # act
+    mcts.execute()
+
+    # assert
+    manifest = mcts.checkpointer.manifest
+    assert len(manifest["chunks"]) <= sandbox_rl.core.checkpoints.Checkpointer.MAX_CHUNKS
+    assert len(os.listdir(tmp_path)) == len(manifest["chunks"]) + 2
+    restored = build_mcts(episodes=episodes, checkpoint_dir=tmp_path)
+    restored.checkpointer.load(restored)
+    assert_same_run(mcts, restored)
+
+
+def test_merge_start_absorbs_older_chunks_no_larger_than_merged_total():
+    # arrange
+    chunks = [{"samples": samples} for samples in [100, 20, 8, 4, 4]]
+
+    # act
+    merge_start = sandbox_rl.core.checkpoints.Checkpointer._merge_start(chunks)
+
+    # assert
+    assert merge_start == 2
+
+
+def fail_next_write(checkpointer):
+    atomic_write = checkpointer._atomic_write
+
+    def failing_write(file_name, write):
+        checkpointer._atomic_write = atomic_write
+        raise OSError("disk full")
+
+    checkpointer._atomic_write = failing_write
+
+
+def test_save_after_failed_write_keeps_previous_checkpoint(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path, checkpoint_every=1)
+    mcts.execute()
+    mcts.episodes = 4
+    fail_next_write(mcts.checkpointer)
+    with pytest.raises(OSError):
+        mcts.execute()
+
+    # act & assert
+    with pytest.raises(OSError):
+        mcts.checkpointer.save(mcts)
+
+    restored = build_mcts(episodes=4, checkpoint_dir=tmp_path)
+    assert restored.checkpointer.load(restored) is True
+    assert restored.episode == 2
+
+
+def test_save_with_overwrite_after_failed_write_writes_full_checkpoint(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path, checkpoint_every=1)
+    mcts.execute()
+    mcts.episodes = 4
+    fail_next_write(mcts.checkpointer)
+    with pytest.raises(OSError):
+        mcts.execute()
+    mcts.checkpointer.overwrite = True
+
+    # act
+    mcts.checkpointer.save(mcts)
+    mcts.checkpointer.wait()
+
+    # assert
+    restored = build_mcts(episodes=4, checkpoint_dir=tmp_path)
+    restored.checkpointer.load(restored)
+    assert_same_run(mcts, restored)
+
+
+def test_load_rejects_checkpoint_saved_with_different_run_config(tmp_path):
+    # arrange
+    mcts = build_mcts(episodes=2, checkpoint_dir=tmp_path)
+    mcts.checkpointer.run_config = {"simulations": 4}
+    mcts.execute()
+    resumed = build_mcts(episodes=4, checkpoint_dir=tmp_path)
+    resumed.checkpointer.run_config = {"simulations": 40}
+
+    # act & assert
+    with pytest.raises(ValueError, match="simulations"):
+        resumed.checkpointer.load(resumed)
+
+
+def test_save_only_removes_its_own_unreferenced_files(tmp_path):
+    # arrange
+    foreign_files = ["replay-notes.txt", "agent-config.npz", "draft.tmp", "replay-00000001-0123abcd.npz"]
+    for file_name in foreign_files:
+        (tmp_path / file_name).write_text("")
+    mcts = build_mcts(episodes=4, checkpoint_dir=tmp_path, checkpoint_every=1)
+
+    # act
+    mcts.execute()
+
+    # assert
+    manifest = mcts.checkpointer.manifest
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        foreign_files + ["checkpoint.json", manifest["agent_file"]] + [chunk["file"] for chunk in manifest["chunks"]]
+    )
+
+
+def test_resumed_run_removes_unreferenced_files_of_the_loaded_run(tmp_path):
+    # arrange
+    build_mcts(episodes=2, checkpoint_dir=tmp_path, checkpoint_every=1).execute()
+    resumed = build_mcts(episodes=4, checkpoint_dir=tmp_path, checkpoint_every=1)
+    resumed.checkpointer.load(resumed)
+
+    # act
+    resumed.execute()
+
+    # assert
+    manifest = resumed.checkpointer.manifest
+    assert sorted(os.listdir(tmp_path)) == sorted(
+        ["checkpoint.json", manifest["agent_file"]] + [chunk["file"] for chunk in manifest["chunks"]]
+    )
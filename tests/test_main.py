@@ -0,0 +1,182 @@
+import json
+import sys
+import pytest
+import sandbox_rl.core.metrics
+import sandbox_rl.main
+
+
+def test_load_config_arguments_override_config_file(tmp_path):
+    # arrange
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"episodes": 7, "simulations": 3}))
+    args = sandbox_rl.main.build_parser().parse_args(["train", "--config", str(config_path), "--simulations", "5"])
+
+    # act
+    config = sandbox_rl.main.load_config(args)
+
+    # assert
+    assert config["episodes"] == 7
+    assert config["simulations"] == 5
+    assert config["c_puct"] == sandbox_rl.main.DEFAULT_CONFIG["c_puct"]
+
+
+def test_load_config_bench_uses_fixed_seed():
+    # arrange
+    args = sandbox_rl.main.build_parser().parse_args(["bench"])
+
+    # act
+    config = sandbox_rl.main.load_config(args)
+
+    # assert
+    assert config["seed"] == sandbox_rl.main.BENCH_SEED
+
+
+def test_run_training_reports_throughput(capsys):
+    # arrange
+    argv = ["train", "--episodes", "2", "--simulations", "4", "--seed", "1", "--log-every", "1"]
+
+    # act
+    exit_code = sandbox_rl.main.main(argv)
+
+    # assert
+    output = capsys.readouterr().out.splitlines()
+    assert exit_code == 0
+    assert len(output) == 2
+    assert "sims/s" in output[-1]
+    assert ("peak rss" in output[-1]) == (sandbox_rl.core.metrics.peak_rss_bytes() is not None)
+
+
+def test_run_benchmark_is_reproducible():
+    # arrange
+    config = dict(sandbox_rl.main.DEFAULT_CONFIG, episodes=3, simulations=4, seed=sandbox_rl.main.BENCH_SEED)
+
+    # act
+    first = sandbox_rl.main.build_learning_agent(config)
+    first.execute()
+    second = sandbox_rl.main.build_learning_agent(config)
+    second.execute()
+
+    # assert
+    assert first.sample_count == second.sample_count
+    for first_sample, second_sample in zip(first.replay_buffer.buffer, second.replay_buffer.buffer):
+        assert first_sample[0].tobytes() == second_sample[0].tobytes()
+
+
+def test_main_profile_writes_dump(tmp_path):
+    # arrange
+    profile_path = tmp_path / "run.prof"
+    argv = ["bench", "--episodes", "1", "--simulations", "2", "--repeats", "1", "--profile", str(profile_path)]
+
+    # act
+    exit_code = sandbox_rl.main.main(argv)
+
+    # assert
+    assert exit_code == 0
+    assert profile_path.exists()
+
+
+def test_throughput_report_omits_peak_rss_without_resource(monkeypatch):
+    # arrange
+    monkeypatch.setitem(sys.modules, "resource", None)
+    meter = sandbox_rl.core.metrics.ThroughputMeter()
+
+    # act
+    report = meter.report(simulations=10, games=1, samples=5)
+
+    # assert
+    assert sandbox_rl.core.metrics.peak_rss_bytes() is None
+    assert "sims/s" in report and "peak rss" not in report
+
+
+@pytest.mark.parametrize("argv", [
+    ["bench", "--repeats", "0"],
+    ["train", "--train-every", "0"],
+    ["train", "--log-every", "-1"],
+    ["train", "--temperature", "-0.5"],
+    ["train", "--checkpoint-every", "0"],
+    ["train", "--resume"],
+])
+def test_main_rejects_invalid_arguments(argv, capsys):
+    # act & assert
+    with pytest.raises(SystemExit) as error:
+        sandbox_rl.main.main(argv)
+
+    assert error.value.code == 2
+    assert "error:" in capsys.readouterr().err
+
+
+def test_main_rejects_invalid_config_file(tmp_path, capsys):
+    # arrange
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps({"episodes": 0}))
+
+    # act & assert
+    with pytest.raises(SystemExit) as error:
+        sandbox_rl.main.main(["train", "--config", str(config_path)])
+
+    assert error.value.code == 2
+    assert "episodes must be a positive integer" in capsys.readouterr().err
+
+
+@pytest.mark.parametrize("file_config, message", [
+    ({"temperature": "hot"}, "temperature must be a number"),
+    ({"temperature": -1.0}, "temperature must be non-negative"),
+    ({"c_puct": None}, "c_puct must be a number"),
+    ({"episodes": True}, "episodes must be a positive integer"),
+    ({"seed": 1.5}, "seed must be an integer"),
+    ([], "must hold a json object"),
+])
+def test_main_rejects_invalid_config_values(file_config, message, tmp_path, capsys):
+    # arrange
+    config_path = tmp_path / "config.json"
+    config_path.write_text(json.dumps(file_config))
+
+    # act & assert
+    with pytest.raises(SystemExit) as error:
+        sandbox_rl.main.main(["train", "--config", str(config_path)])
+
+    assert error.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def test_main_refuses_existing_checkpoint_without_resume_or_overwrite(tmp_path, capsys):
+    # arrange
+    argv = ["train", "--episodes", "2", "--simulations", "2", "--log-every", "0", "--checkpoint-dir", str(tmp_path)]
+    sandbox_rl.main.main(argv)
+
+    # act & assert
+    with pytest.raises(SystemExit) as error:
+        sandbox_rl.main.main(argv)
+
+    assert error.value.code == 2
+    assert "--resume or --overwrite" in capsys.readouterr().err
+    assert sandbox_rl.main.main(argv + ["--overwrite"]) == 0
+
+
+def test_main_resume_restores_saved_run_config(tmp_path):
+    # arrange
+    argv = ["train", "--episodes", "2", "--log-every", "0", "--checkpoint-dir", str(tmp_path)]
+    sandbox_rl.main.main(argv + ["--simulations", "3", "--buffer-size", "50", "--seed", "4"])
+    args = sandbox_rl.main.build_parser().parse_args(argv + ["--resume", "--episodes", "3"])
+
+    # act
+    config = sandbox_rl.main.load_config(args)
+
+    # assert
+    assert config["episodes"] == 3
+    assert config["simulations"] == 3
+    assert config["buffer_size"] == 50
+    assert config["seed"] == 4
+
+
+def test_main_resume_rejects_changed_run_config(tmp_path, capsys):
+    # arrange
+    argv = ["train", "--episodes", "2", "--simulations", "3", "--log-every", "0", "--checkpoint-dir", str(tmp_path)]
+    sandbox_rl.main.main(argv)
+
+    # act & assert
+    with pytest.raises(SystemExit) as error:
+        sandbox_rl.main.main(argv + ["--resume", "--simulations", "40"])
+
+    assert error.value.code == 2
+    assert "simulations is 40 but the checkpoint was saved with 3" in capsys.readouterr().err